@@ -1,14 +1,18 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import base64
 import io
-from fpdf import FPDF
-import tempfile
 import os
+import logging
+import data_sources
+from data_sources import source_from_uri, load_tables
+import leaderboards
+from leaderboards import InfluencerLeaderboard
+from disk_cache import DiskCache, code_version, default_cache_dir
+from chart_data import downsample_lines, cap_points, group_means, box_stats, box_figure
+from comparison import CURRENT, PREVIOUS, label_periods, compare_groups, compare_totals
 
 # Set page config
 st.set_page_config(
@@ -18,13 +22,21 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Load data with caching
-@st.cache_data
-def load_data():
-    influencers = pd.read_csv('influencers.csv')
-    posts = pd.read_csv('posts.csv')
-    tracking_data = pd.read_csv('tracking_data.csv')
-    payouts = pd.read_csv('payouts.csv')
+# Where the input tables live: a local directory (default), a directory of
+# partitioned CSVs, sqlite:///path.db or an http(s):// base URL
+DATA_SOURCE = os.environ.get('ROI_DATA_SOURCE', '.')
+
+# Parsed and merged data is also kept on disk, keyed by the input files and the
+# code that builds it, so restarts and other replicas on this host reuse it
+CACHE_DIR = os.environ.get('ROI_CACHE_DIR', default_cache_dir())
+CACHE_MAX_MB = int(os.environ.get('ROI_CACHE_MAX_MB', '1024'))
+
+logger = logging.getLogger(__name__)
+
+# Load data
+def load_data(source):
+    # The four tables are read concurrently
+    influencers, posts, tracking_data, payouts = load_tables(source)
     
     # Convert date columns to datetime
     for df in [posts, tracking_data, payouts]:
@@ -35,10 +47,7 @@ def load_data():
     
     return influencers, posts, tracking_data, payouts
 
-influencers, posts, tracking_data, payouts = load_data()
-
 # Merge data for analysis
-@st.cache_data
 def create_merged_data(influencers, posts, tracking_data, payouts):
     # Merge tracking data with influencers
     campaign_performance = tracking_data.merge(
@@ -86,7 +95,46 @@ def create_merged_data(influencers, posts, tracking_data, payouts):
     
     return campaign_performance
 
-campaign_performance = create_merged_data(influencers, posts, tracking_data, payouts)
+# Raw tables, merged data and the per-influencer totals backing the top
+# influencer tables. Kept as a shared resource (not copied per rerun) so
+# top-K lists survive between reruns.
+@st.cache_resource
+def load_dashboard_data(data_source=DATA_SOURCE):
+    source = source_from_uri(data_source)
+    try:
+        # The disk cache is only a shortcut; if it can't be used, compute as usual
+        cache, key = None, None
+        try:
+            cache = DiskCache(CACHE_DIR, max_bytes=CACHE_MAX_MB << 20)
+            fingerprint = source.fingerprint()
+            if fingerprint is not None:
+                key = cache.key(
+                    fingerprint,
+                    code_version(data_sources, load_data, create_merged_data, leaderboards),
+                    pd.__version__
+                )
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
+        except OSError as e:
+            logger.warning("Disk cache unavailable, loading without it: %s", e)
+            cache = None
+
+        influencers, posts, tracking_data, payouts = load_data(source)
+        campaign_performance = create_merged_data(influencers, posts, tracking_data, payouts)
+        leaderboard = InfluencerLeaderboard(campaign_performance)
+        result = (influencers, posts, tracking_data, payouts, campaign_performance, leaderboard)
+
+        if cache is not None and key is not None:
+            try:
+                cache.put(key, result)
+            except OSError as e:
+                logger.warning("Could not write disk cache entry: %s", e)
+        return result
+    finally:
+        source.close()
+
+influencers, posts, tracking_data, payouts, campaign_performance, leaderboard = load_dashboard_data()
 
 # Sidebar filters
 st.sidebar.header("Filters")
@@ -111,6 +159,36 @@ else:
 start_date = pd.to_datetime(start_date)
 end_date = pd.to_datetime(end_date) + timedelta(days=1)  # Include end date
 
+# Optional second date range to compare against, by default the equally long
+# stretch right before the selected one. Like the date filter, a range also
+# takes in the day after its end date, so the default ends two days before
+# the selected start to keep the two apart.
+compare_periods = st.sidebar.checkbox("Compare with another period")
+
+if compare_periods:
+    default_compare_end = start_date - timedelta(days=2)
+    default_compare_start = max(default_compare_end - (end_date - start_date - timedelta(days=1)),
+                                pd.to_datetime(min_date))
+    if default_compare_end < pd.to_datetime(min_date):
+        st.sidebar.info("There is no earlier data to compare against. Pick a later start date to compare periods.")
+        compare_periods = False
+
+if compare_periods:
+    comparison_range = st.sidebar.date_input(
+        "Comparison Range",
+        value=(default_compare_start, default_compare_end),
+        min_value=min_date,
+        max_value=max_date
+    )
+    if len(comparison_range) == 2:
+        compare_start, compare_end = comparison_range
+    else:
+        compare_start, compare_end = default_compare_start, default_compare_end
+    compare_start = pd.to_datetime(compare_start)
+    compare_end = pd.to_datetime(compare_end) + timedelta(days=1)  # Include end date
+    if compare_start <= end_date and compare_end >= start_date:
+        st.sidebar.warning("The comparison range overlaps the selected range; shared days count in both.")
+
 # Other filters
 selected_brands = st.sidebar.multiselect(
     "Brands",
@@ -137,12 +215,12 @@ selected_genders = st.sidebar.multiselect(
 )
 
 # Apply filters
-def filter_data(df):
+def filter_data(df, dates=True):
     filtered = df.copy()
     
-    if 'date' in filtered.columns:
+    if dates and 'date' in filtered.columns:
         filtered = filtered[(filtered['date'] >= start_date) & (filtered['date'] <= end_date)]
-    elif 'payout_date' in filtered.columns:
+    elif dates and 'payout_date' in filtered.columns:
         filtered = filtered[(filtered['payout_date'] >= start_date) & (filtered['payout_date'] <= end_date)]
     
     if 'brand' in filtered.columns and selected_brands:
@@ -159,10 +237,27 @@ def filter_data(df):
     
     return filtered
 
-filtered_performance = filter_data(campaign_performance)
-filtered_posts = filter_data(posts)
-filtered_payouts = filter_data(payouts)
-filtered_influencers = filter_data(influencers)
+if compare_periods:
+    # Brand and persona filters are applied once and shared by both periods;
+    # each row is then tagged with the period(s) it falls in
+    periods = {
+        CURRENT: (start_date, end_date),
+        PREVIOUS: (compare_start, compare_end)
+    }
+    performance_periods = label_periods(filter_data(campaign_performance, dates=False), 'date', periods)
+    payout_periods = label_periods(filter_data(payouts, dates=False), 'payout_date', periods)
+    filtered_performance = performance_periods[performance_periods['period'] == CURRENT].drop(columns='period')
+    filtered_payouts = payout_periods[payout_periods['period'] == CURRENT].drop(columns='period')
+else:
+    filtered_performance = filter_data(campaign_performance)
+    filtered_payouts = filter_data(payouts)
+
+# Per-influencer totals under the current filters
+def select_influencer_totals():
+    return leaderboard.select(
+        start_date, end_date, selected_brands,
+        selected_platforms, selected_categories, selected_genders
+    )
 
 # Dashboard title
 st.title("HealthKart Influencer Campaign Dashboard")
@@ -170,33 +265,47 @@ st.title("HealthKart Influencer Campaign Dashboard")
 # KPI cards
 st.subheader("Campaign Performance Overview")
 
+kpi_changes = None
+if compare_periods:
+    kpi_changes = pd.concat([
+        compare_totals(performance_periods, {'revenue': 'sum', 'ROAS': 'mean', 'orders': 'sum'}),
+        compare_totals(payout_periods, {'total_payout': 'sum'})
+    ])
+
+# Change against the comparison period, e.g. "+₹1,200 (+4.5%)"
+def kpi_delta(metric, prefix="", decimals=0):
+    if kpi_changes is None or pd.isna(kpi_changes[f'{metric}_change']):
+        return None
+    change = kpi_changes[f'{metric}_change']
+    pct = kpi_changes[f'{metric}_change_pct']
+    delta = f"{'-' if change < 0 else '+'}{prefix}{abs(change):,.{decimals}f}"
+    if not pd.isna(pct):
+        delta += f" ({pct:+.1f}%)"
+    return delta
+
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     total_revenue = filtered_performance['revenue'].sum()
-    st.metric("Total Revenue", f"₹{total_revenue:,.0f}")
+    st.metric("Total Revenue", f"₹{total_revenue:,.0f}", delta=kpi_delta('revenue', prefix="₹"))
 
 with col2:
     total_payout = filtered_payouts['total_payout'].sum()
-    st.metric("Total Payout", f"₹{total_payout:,.0f}")
+    st.metric("Total Payout", f"₹{total_payout:,.0f}", delta=kpi_delta('total_payout', prefix="₹"))
 
 with col3:
     avg_roas = filtered_performance['ROAS'].mean() if not filtered_performance.empty else 0
-    st.metric("Average ROAS", f"{avg_roas:.2f}")
+    st.metric("Average ROAS", f"{avg_roas:.2f}", delta=kpi_delta('ROAS', decimals=2))
 
 with col4:
     total_orders = filtered_performance['orders'].sum()
-    st.metric("Total Orders", f"{total_orders:,.0f}")
+    st.metric("Total Orders", f"{total_orders:,.0f}", delta=kpi_delta('orders'))
 
-# Tabs
-tab1, tab2, tab3, tab4 = st.tabs([
-    "Campaign Performance", 
-    "Influencer Insights", 
-    "ROAS Analysis", 
-    "Payout Tracking"
-])
+# Views. Each one only computes its own data and figures.
+def render_campaign_performance():
+    # Imported here rather than at the top so the KPI cards paint before plotly loads
+    import plotly.express as px
 
-with tab1:
     st.subheader("Campaign Performance Metrics")
     
     # Group by campaign and calculate metrics
@@ -262,7 +371,7 @@ with tab1:
     
     # Line chart for revenue and payout over time
     fig = px.line(
-        time_metrics,
+        downsample_lines(time_metrics, 'period', ['revenue', 'total_payout'], 'brand'),
         x='period',
         y=['revenue', 'total_payout'],
         color='brand',
@@ -271,25 +380,21 @@ with tab1:
     )
     st.plotly_chart(fig, use_container_width=True)
 
-with tab2:
+
+def render_influencer_insights():
+    import plotly.express as px
+
     st.subheader("Influencer Insights")
     
-    # Top influencers by revenue
-    top_influencers = filtered_performance.groupby(['influencer_id', 'name', 'platform', 'category', 'gender']).agg({
-        'revenue': 'sum',
-        'orders': 'sum',
-        'total_payout': 'sum',
-        'ROAS': 'mean',
-        'reach': 'mean',
-        'calculated_engagement_rate': 'mean'
-    }).reset_index()
+    influencer_totals = select_influencer_totals()
+    top_influencers = leaderboard.frame(influencer_totals)
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("**Top Influencers by Revenue**")
         st.dataframe(
-            top_influencers.sort_values('revenue', ascending=False).head(10),
+            leaderboard.top('revenue', 10, influencer_totals),
             column_config={
                 'revenue': st.column_config.NumberColumn("Revenue", format="₹%.0f"),
                 'total_payout': st.column_config.NumberColumn("Payout", format="₹%.0f"),
@@ -303,7 +408,7 @@ with tab2:
     with col2:
         st.markdown("**Top Influencers by ROAS**")
         st.dataframe(
-            top_influencers[top_influencers['orders'] > 0].sort_values('ROAS', ascending=False).head(10),
+            leaderboard.top('ROAS', 10, influencer_totals, require_orders=True),
             column_config={
                 'revenue': st.column_config.NumberColumn("Revenue", format="₹%.0f"),
                 'total_payout': st.column_config.NumberColumn("Payout", format="₹%.0f"),
@@ -341,13 +446,15 @@ with tab2:
     st.subheader("Engagement vs Performance")
     
     if not filtered_performance.empty:
+        # Biggest earners first if there are more influencers than the chart can show
         fig = px.scatter(
-            top_influencers,
+            cap_points(top_influencers, 'revenue'),
             x='calculated_engagement_rate',
             y='ROAS',
             size='revenue',
             color='platform',
             hover_name='name',
+            render_mode='webgl',
             title="Engagement Rate vs ROAS",
             labels={
                 'calculated_engagement_rate': 'Engagement Rate (%)',
@@ -357,17 +464,28 @@ with tab2:
         )
         st.plotly_chart(fig, use_container_width=True)
 
-with tab3:
+
+def render_roas_analysis():
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     st.subheader("ROAS Analysis")
     
-    # ROAS distribution
-    fig = px.box(
+    # ROAS distribution, from quartiles computed here rather than every row;
+    # only values outside the whiskers are sent as points
+    roas_stats, roas_outliers = box_stats(
         filtered_performance[filtered_performance['orders'] > 0],
-        y='ROAS',
+        'ROAS',
+        ['platform', 'brand']
+    )
+    fig = box_figure(
+        roas_stats,
+        roas_outliers,
         x='platform',
+        y='ROAS',
         color='brand',
         title="ROAS Distribution by Platform and Brand",
-        points="all"
+        y_title='ROAS'
     )
     st.plotly_chart(fig, use_container_width=True)
     
@@ -375,18 +493,19 @@ with tab3:
     st.subheader("Incremental ROAS Analysis")
     
     if not filtered_performance.empty:
+        campaign_roas = group_means(filtered_performance, 'campaign', ['ROAS', 'incremental_ROAS'])
         fig = go.Figure()
         
         fig.add_trace(go.Bar(
-            x=filtered_performance['campaign'],
-            y=filtered_performance['ROAS'],
+            x=campaign_roas['campaign'],
+            y=campaign_roas['ROAS'],
             name='ROAS',
             marker_color='#636EFA'
         ))
         
         fig.add_trace(go.Bar(
-            x=filtered_performance['campaign'],
-            y=filtered_performance['incremental_ROAS'],
+            x=campaign_roas['campaign'],
+            y=campaign_roas['incremental_ROAS'],
             name='Incremental ROAS',
             marker_color='#EF553B'
         ))
@@ -395,7 +514,7 @@ with tab3:
             barmode='group',
             title="ROAS vs Incremental ROAS by Campaign",
             xaxis_title="Campaign",
-            yaxis_title="Value"
+            yaxis_title="Average Value"
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -427,7 +546,10 @@ with tab3:
         )
         st.plotly_chart(fig, use_container_width=True)
 
-with tab4:
+
+def render_payout_tracking():
+    import plotly.express as px
+
     st.subheader("Payout Tracking")
     
     # Payout summary
@@ -478,7 +600,7 @@ with tab4:
     }).reset_index()
     
     fig = px.line(
-        payout_time,
+        downsample_lines(payout_time, 'payout_date', 'total_payout', 'basis'),
         x='payout_date',
         y='total_payout',
         color='basis',
@@ -487,6 +609,117 @@ with tab4:
     )
     st.plotly_chart(fig, use_container_width=True)
 
+# Column settings for compare_groups output: each metric is shown for both
+# periods plus its absolute and percentage change
+def comparison_columns(metrics):
+    config = {}
+    for metric, (label, fmt) in metrics.items():
+        config[f'{metric}_{CURRENT}'] = st.column_config.NumberColumn(f"{label} (Current)", format=fmt)
+        config[f'{metric}_{PREVIOUS}'] = st.column_config.NumberColumn(f"{label} (Comparison)", format=fmt)
+        config[f'{metric}_change'] = st.column_config.NumberColumn(f"{label} Change", format=fmt)
+        config[f'{metric}_change_pct'] = st.column_config.NumberColumn(f"{label} Change %", format="%+.1f%%")
+    return config
+
+def render_period_comparison():
+    import plotly.express as px
+
+    st.subheader("Period Comparison")
+    st.caption(
+        f"Current: {start_date.date()} to {(end_date - timedelta(days=1)).date()} | "
+        f"Comparison: {compare_start.date()} to {(compare_end - timedelta(days=1)).date()}"
+    )
+    
+    # Campaign metrics for both periods from one groupby
+    campaign_comparison = compare_groups(performance_periods, ['campaign', 'brand'], {
+        'revenue': 'sum',
+        'orders': 'sum',
+        'total_payout': 'sum',
+        'clicks': 'sum',
+        'ROAS': 'mean',
+        'incremental_ROAS': 'mean',
+        'CPO': 'mean'
+    })
+    
+    st.markdown("**Campaign Performance**")
+    st.dataframe(
+        campaign_comparison.sort_values(f'revenue_{CURRENT}', ascending=False),
+        column_config=comparison_columns({
+            'revenue': ("Revenue", "₹%.0f"),
+            'orders': ("Orders", "%.0f"),
+            'total_payout': ("Payout", "₹%.0f"),
+            'clicks': ("Clicks", "%.0f"),
+            'ROAS': ("ROAS", "%.2f"),
+            'incremental_ROAS': ("Incremental ROAS", "%.2f"),
+            'CPO': ("Cost Per Order", "₹%.2f")
+        }),
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    revenue_by_campaign = campaign_comparison.groupby('campaign')[
+        [f'revenue_{CURRENT}', f'revenue_{PREVIOUS}']
+    ].sum().reset_index()
+    fig = px.bar(
+        revenue_by_campaign,
+        x='campaign',
+        y=[f'revenue_{CURRENT}', f'revenue_{PREVIOUS}'],
+        barmode='group',
+        title="Revenue by Campaign: Current vs Comparison Period",
+        labels={'value': 'Revenue (₹)', 'campaign': 'Campaign', 'variable': 'Period'}
+    )
+    fig.for_each_trace(lambda t: t.update(name="Current" if t.name.endswith(CURRENT) else "Comparison"))
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Persona cells for both periods
+    persona_comparison = compare_groups(performance_periods, ['category', 'gender', 'platform'], {
+        'revenue': 'sum',
+        'orders': 'sum',
+        'total_payout': 'sum',
+        'ROAS': 'mean',
+        'influencer_id': 'nunique'
+    })
+    
+    st.markdown("**Persona Performance**")
+    st.dataframe(
+        persona_comparison.sort_values(f'revenue_{CURRENT}', ascending=False),
+        column_config=comparison_columns({
+            'revenue': ("Revenue", "₹%.0f"),
+            'orders': ("Orders", "%.0f"),
+            'total_payout': ("Payout", "₹%.0f"),
+            'ROAS': ("ROAS", "%.2f"),
+            'influencer_id': ("Influencers", "%.0f")
+        }),
+        hide_index=True,
+        use_container_width=True
+    )
+
+VIEWS = {
+    "Campaign Performance": render_campaign_performance,
+    "Influencer Insights": render_influencer_insights,
+    "ROAS Analysis": render_roas_analysis,
+    "Payout Tracking": render_payout_tracking,
+}
+if compare_periods:
+    VIEWS["Period Comparison"] = render_period_comparison
+
+# Lazy mode shows one view at a time and only computes that view on a rerun.
+# Set ROI_LAZY_VIEWS=0 to render every view in tabs instead.
+LAZY_VIEWS = os.environ.get('ROI_LAZY_VIEWS', '1') != '0'
+
+if LAZY_VIEWS:
+    active_view = st.radio(
+        "View",
+        list(VIEWS),
+        horizontal=True,
+        key="active_view",
+        label_visibility="collapsed"
+    )
+    VIEWS[active_view]()
+else:
+    for tab, render in zip(st.tabs(list(VIEWS)), VIEWS.values()):
+        with tab:
+            render()
+
 # Data export functionality
 st.sidebar.header("Data Export")
 
@@ -497,17 +730,30 @@ def to_excel(df):
     processed_data = output.getvalue()
     return processed_data
 
-from fpdf import FPDF
-from fpdf.enums import XPos, YPos
+@st.cache_resource
+def report_fonts(chars):
+    # Full DejaVu fonts take fpdf over 100 ms to parse, and it parses them for
+    # every document; subsets holding just the printed characters are made
+    # once per process and parse in a few ms
+    import tempfile
+    from reports import subset_fonts
+    directory = tempfile.TemporaryDirectory(prefix='roi_fonts_')
+    return directory, subset_fonts(chars, directory.name)
 
 def create_pdf_report():
+    # fpdf is only needed once someone asks for a report
+    from fpdf import FPDF
+    from fpdf.enums import XPos, YPos
+    from reports import REPORT_CHARS, add_fonts
+
     # Create PDF with Unicode support
     pdf = FPDF()
     pdf.add_page()
     
-    # Add a Unicode-compatible font (DejaVuSans supports most Unicode characters)
-    pdf.add_font("DejaVu", "", "DejaVuSans.ttf", uni=True)
-    pdf.add_font("DejaVu", "B", "DejaVuSans-Bold.ttf", uni=True)
+    # Add a Unicode-compatible font (DejaVuSans supports most Unicode characters).
+    # Besides fixed labels and numbers the report only prints influencer names.
+    _, font_files = report_fonts(REPORT_CHARS | frozenset(''.join(influencers['name'].astype(str))))
+    add_fonts(pdf, font_files)
     
     # Set font
     pdf.set_font("DejaVu", size=12)
@@ -542,7 +788,7 @@ def create_pdf_report():
     pdf.cell(0, 10, "Top 5 Influencers by Revenue", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_font("DejaVu", size=12)
     
-    top_influencers_list = top_influencers.sort_values('revenue', ascending=False).head(5)
+    top_influencers_list = leaderboard.top('revenue', 5, select_influencer_totals())
     for idx, row in top_influencers_list.iterrows():
         pdf.cell(0, 10, f"{row['name']} - {format_currency(row['revenue'])} (ROAS: {row['ROAS']:.2f})", 
                 new_x=XPos.LMARGIN, new_y=YPos.NEXT)
@@ -564,16 +810,7 @@ with col1:
 with col2:
     if st.button("Generate PDF Report"):
         pdf = create_pdf_report()
-        
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            tmp.close()
-            pdf.output(tmp.name)
-            
-            with open(tmp.name, "rb") as f:
-                pdf_bytes = f.read()
-            
-            os.unlink(tmp.name)
+        pdf_bytes = bytes(pdf.output())
         
         st.sidebar.download_button(
             label="Download PDF Report",
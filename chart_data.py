@@ -0,0 +1,206 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from leaderboards import top_k_positions
+
+# Most points a single figure should send to the browser
+POINT_BUDGET = int(os.environ.get('ROI_CHART_POINT_BUDGET', '5000'))
+
+
+def _as_number(values):
+    values = pd.Series(values)
+    if not pd.api.types.is_numeric_dtype(values):
+        values = pd.to_datetime(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype('int64').to_numpy(dtype=float)
+    return values.to_numpy(dtype=float)
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the points Largest-Triangle-Three-Buckets keeps out of ``x``/``y``.
+
+    ``x`` must be sorted. The first and last points are always kept; every
+    bucket in between contributes the point forming the largest triangle with
+    the previously kept point and the average of the next bucket.
+    """
+    n = len(x)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])[:max(n_out, 0)]
+
+    x = np.asarray(x, dtype=float)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    kept = np.empty(n_out, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        kept[i + 1] = prev
+    return kept
+
+
+def downsample_lines(df, x, y, color=None, budget=POINT_BUDGET):
+    """Thin out line chart data so the figure stays within ``budget`` points.
+
+    The budget is split evenly across traces (one per ``color`` group and
+    ``y`` column) and each trace is reduced with LTTB.
+    """
+    ys = [y] if isinstance(y, str) else list(y)
+    groups = [df] if color is None else [g for _, g in df.groupby(color, sort=False)]
+    per_trace = max(budget // max(len(groups) * len(ys), 1), 3)
+    if all(len(g) <= per_trace for g in groups):
+        return df
+
+    kept = []
+    for group in groups:
+        group = group.sort_values(x)
+        if len(group) <= per_trace:
+            kept.append(group)
+            continue
+        xs = _as_number(group[x])
+        # Rows are shared by every y column, so each column gets its share
+        idx = np.unique(np.concatenate([
+            lttb_indices(xs, group[col].to_numpy(dtype=float), max(per_trace // len(ys), 3))
+            for col in ys
+        ]))
+        kept.append(group.iloc[idx])
+    return pd.concat(kept)
+
+
+def cap_points(df, priority, budget=POINT_BUDGET):
+    """At most ``budget`` rows of ``df``, keeping the largest ``priority`` values."""
+    if len(df) <= budget:
+        return df
+    return df.iloc[top_k_positions(df[priority].to_numpy(dtype=float), budget)]
+
+
+def group_means(df, by, columns):
+    """One row per ``by`` group with the mean of each column."""
+    return df.groupby(by)[columns].mean().reset_index()
+
+
+def box_stats(df, value, by, budget=POINT_BUDGET):
+    """Quartiles and Tukey fences of ``value`` per group of the ``by`` columns.
+
+    Returns ``(stats, outliers)``: one row of box statistics per group, and
+    the values outside the fences. When there are more outliers than
+    ``budget``, the ones furthest from their group's median (in IQRs) are
+    kept. Non-finite values are left out, as plotly would drop them anyway.
+    """
+    rows = []
+    outliers = []
+    for key, group in df.groupby(by, sort=False):
+        values = group[value].to_numpy(dtype=float)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            continue
+        q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        in_fence = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+        inside = values[in_fence]
+        if not in_fence.all():
+            outside = values[~in_fence]
+            outliers.append(pd.DataFrame({
+                **dict(zip(by, key)),
+                value: outside,
+                'distance': np.abs(outside - median) / (iqr if iqr > 0 else 1.0),
+            }))
+        rows.append({
+            **dict(zip(by, key)),
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'lowerfence': inside.min(),
+            'upperfence': inside.max(),
+            'mean': values.mean(),
+            'count': len(values),
+        })
+    columns = by + ['q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean', 'count']
+    stats = pd.DataFrame(rows, columns=columns)
+    if outliers:
+        outliers = cap_points(pd.concat(outliers, ignore_index=True), 'distance', budget)
+    else:
+        outliers = pd.DataFrame(columns=by + [value, 'distance'])
+    return stats, outliers
+
+
+def box_figure(stats, outliers, x, y, color, title, y_title):
+    """Grouped box plot drawn from ``box_stats`` output instead of raw points.
+
+    Outliers are drawn as a WebGL scatter on top. WebGL traces can't join
+    plotly's box grouping, so boxes are placed on a numeric axis by hand
+    (one slot per ``x`` value, split between ``color`` groups) and labelled
+    with the ``x`` values.
+    """
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+
+    categories = list(dict.fromkeys(stats[x]))
+    names = list(dict.fromkeys(stats[color]))
+    slot = 0.8 / max(len(names), 1)
+    rng = np.random.default_rng(0)
+
+    fig = go.Figure()
+    for i, name in enumerate(names):
+        colour = qualitative.Plotly[i % len(qualitative.Plotly)]
+        offset = (i - (len(names) - 1) / 2) * slot
+
+        group = stats[stats[color] == name]
+        fig.add_trace(go.Box(
+            name=str(name),
+            legendgroup=str(name),
+            x=[categories.index(c) + offset for c in group[x]],
+            q1=group['q1'],
+            median=group['median'],
+            q3=group['q3'],
+            lowerfence=group['lowerfence'],
+            upperfence=group['upperfence'],
+            mean=group['mean'],
+            width=slot * 0.8,
+            marker_color=colour,
+            boxpoints=False
+        ))
+
+        points = outliers[outliers[color] == name]
+        if len(points):
+            positions = np.array([categories.index(c) for c in points[x]]) + offset
+            fig.add_trace(go.Scattergl(
+                name=str(name),
+                legendgroup=str(name),
+                showlegend=False,
+                x=positions + rng.uniform(-slot * 0.2, slot * 0.2, len(points)),
+                y=points[y],
+                mode='markers',
+                marker=dict(color=colour, size=5, opacity=0.6),
+                customdata=points[x],
+                hovertemplate=f"{x}=%{{customdata}}<br>{y}=%{{y}}<extra>{name}</extra>"
+            ))
+
+    fig.update_layout(
+        title=title,
+        xaxis=dict(
+            title=x,
+            tickmode='array',
+            tickvals=list(range(len(categories))),
+            ticktext=categories,
+            range=[-0.5, len(categories) - 0.5]
+        ),
+        yaxis_title=y_title,
+        legend_title=color
+    )
+    return fig
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+CURRENT = 'current'
+PREVIOUS = 'previous'
+PERIODS = [CURRENT, PREVIOUS]
+
+
+def label_periods(df, date_col, periods):
+    """Rows of ``df`` that fall in any of ``periods``, with a ``period`` column.
+
+    ``periods`` maps a label to a ``(start, end)`` window, compared the same
+    way as the sidebar date filter (``start <= date <= end``). Disjoint
+    windows are labelled in a single pass; rows in overlapping windows are
+    repeated once per window.
+    """
+    dates = df[date_col]
+    masks = {label: ((dates >= start) & (dates <= end)).to_numpy() for label, (start, end) in periods.items()}
+    labels = list(periods)
+
+    if np.sum(list(masks.values()), axis=0).max(initial=0) <= 1:
+        period = np.select(list(masks.values()), labels, default='')
+        keep = period != ''
+        labelled = df[keep].assign(period=period[keep])
+    else:
+        labelled = pd.concat([df[mask].assign(period=label) for label, mask in masks.items()])
+    labelled['period'] = pd.Categorical(labelled['period'], categories=labels)
+    return labelled
+
+
+def _with_changes(wide, metrics, labels):
+    current, previous = labels
+    result = {}
+    for metric in metrics:
+        now, before = wide[(metric, current)], wide[(metric, previous)]
+        result[f'{metric}_{current}'] = now
+        result[f'{metric}_{previous}'] = before
+        result[f'{metric}_change'] = now - before
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result[f'{metric}_change_pct'] = (now - before) / before.abs().replace(0, np.nan) * 100
+    return pd.DataFrame(result, index=wide.index)
+
+
+def compare_groups(labelled, keys, agg, labels=PERIODS):
+    """``groupby(keys).agg(agg)`` for every period at once, side by side.
+
+    The period is just one more grouping key, so both periods share a single
+    groupby. Each metric gets ``_<label>`` columns for both periods plus
+    ``_change`` and ``_change_pct``. Groups missing from a period show NaN.
+    """
+    metrics = list(agg)
+    grouped = labelled.groupby(keys + ['period'], observed=True).agg(agg)
+    wide = grouped.unstack('period')
+    wide = wide.reindex(columns=pd.MultiIndex.from_product([metrics, labels]))
+    return _with_changes(wide, metrics, labels).reset_index()
+
+
+def compare_totals(labelled, agg, labels=PERIODS):
+    """Single-row totals per period, laid out like ``compare_groups``."""
+    metrics = list(agg)
+    grouped = labelled.groupby('period', observed=False).agg(agg).reindex(labels)
+    wide = grouped.unstack().to_frame().T
+    return _with_changes(wide, metrics, labels).iloc[0]
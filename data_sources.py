@@ -0,0 +1,260 @@
+import glob
+import hashlib
+import http.client
+import io
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+# Tables the dashboard needs, in the order load_data() returns them
+TABLES = ['influencers', 'posts', 'tracking_data', 'payouts']
+
+# (path, size, mtime_ns) -> sha256, so unchanged files are hashed once per process
+_file_hashes = {}
+
+
+def file_fingerprint(path):
+    """``(path, size, mtime_ns, sha256)`` for a file."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        _file_hashes[key] = digest.hexdigest()
+    return key + (_file_hashes[key],)
+
+
+class DataSource:
+    """Base class for anything that can hand back a table as a DataFrame.
+
+    Concurrent work on a source (see ``map``) runs on one thread pool that
+    lives as long as the source, so per-thread connections kept by a
+    subclass are reused across fingerprinting and reading.
+    """
+
+    max_workers = len(TABLES)
+
+    def map(self, fn, items):
+        """``[fn(item) for item in items]``, run on the source's thread pool."""
+        pool = getattr(self, '_executor', None)
+        if pool is None:
+            pool = self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=type(self).__name__
+            )
+        return list(pool.map(fn, items))
+
+    def read_table(self, name):
+        raise NotImplementedError
+
+    def fingerprint(self, names=TABLES):
+        """Something that changes whenever the tables' contents do, or None
+        if the source can't tell."""
+        return None
+
+    def close(self):
+        pool = getattr(self, '_executor', None)
+        if pool is not None:
+            pool.shutdown()
+            self._executor = None
+
+
+class LocalFileSource(DataSource):
+    """One CSV per table, e.g. ``influencers.csv`` in ``base_dir``."""
+
+    def __init__(self, base_dir='.'):
+        self.base_dir = base_dir
+
+    def read_table(self, name):
+        return pd.read_csv(os.path.join(self.base_dir, f'{name}.csv'))
+
+    def fingerprint(self, names=TABLES):
+        return [file_fingerprint(os.path.join(self.base_dir, f'{name}.csv')) for name in names]
+
+
+class PartitionedDirectorySource(DataSource):
+    """A directory per table holding any number of CSV partitions.
+
+    ``tracking_data/2025-06.csv``, ``tracking_data/2025-07.csv`` ... are
+    concatenated in file-name order.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+
+    def read_table(self, name):
+        parts = sorted(glob.glob(os.path.join(self.base_dir, name, '*.csv')))
+        if not parts:
+            raise FileNotFoundError(f"No partitions found for '{name}' in {self.base_dir}")
+        return pd.concat([pd.read_csv(p) for p in parts], ignore_index=True)
+
+    def fingerprint(self, names=TABLES):
+        return [
+            file_fingerprint(p)
+            for name in names
+            for p in sorted(glob.glob(os.path.join(self.base_dir, name, '*.csv')))
+        ]
+
+
+class SQLiteSource(DataSource):
+    """Tables stored in a SQLite database under the same names."""
+
+    def __init__(self, path):
+        self.path = path
+        # sqlite3 connections can't be shared across threads, so keep one per
+        # worker thread and reuse it for every table that thread reads
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, check_same_thread=False)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def read_table(self, name):
+        if name not in TABLES:
+            raise ValueError(f"Unknown table '{name}'")
+        return pd.read_sql_query(f'SELECT * FROM "{name}"', self._connection())
+
+    def fingerprint(self, names=TABLES):
+        # Written-back WAL pages change the main file, pending ones the -wal file
+        files = [self.path] + [p for p in (self.path + '-wal',) if os.path.exists(p)]
+        return [file_fingerprint(p) for p in files]
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+        super().close()
+
+
+class HTTPSource(DataSource):
+    """CSV files served over HTTP(S), e.g. an object-store bucket or a static
+    file server: ``<base_url>/influencers.csv`` and so on.
+
+    Each worker thread keeps a persistent keep-alive connection to the host,
+    and failed requests are retried with exponential backoff.
+    """
+
+    def __init__(self, base_url, retries=3, backoff=0.5, timeout=30):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {base_url}")
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self, fresh=False):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and not fresh:
+            return conn
+        if conn is not None:
+            conn.close()
+        conn_cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        conn = conn_cls(self.netloc, timeout=self.timeout)
+        self._local.conn = conn
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _get(self, path):
+        last_error = None
+        for attempt in range(self.retries + 1):
+            # A dropped keep-alive connection shows up as an error on reuse,
+            # so every retry starts from a fresh connection
+            conn = self._connection(fresh=attempt > 0)
+            try:
+                conn.request('GET', path, headers={'Connection': 'keep-alive'})
+                response = conn.getresponse()
+                body = response.read()
+                if response.status == 200:
+                    return body
+                last_error = IOError(f"GET {path} returned HTTP {response.status}")
+                # Client errors won't go away by asking again
+                if 400 <= response.status < 500 and response.status != 429:
+                    break
+            except (http.client.HTTPException, OSError) as e:
+                last_error = e
+            if attempt < self.retries:
+                time.sleep(self.backoff * (2 ** attempt))
+        raise last_error
+
+    def read_table(self, name):
+        body = self._get(f'{self.prefix}/{name}.csv')
+        return pd.read_csv(io.BytesIO(body))
+
+    def _head(self, name):
+        path = f'{self.prefix}/{name}.csv'
+        conn = self._connection()
+        try:
+            conn.request('HEAD', path, headers={'Connection': 'keep-alive'})
+            response = conn.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            self._connection(fresh=True)
+            return None
+        validators = [response.getheader(h) for h in ('ETag', 'Last-Modified', 'Content-Length')]
+        if response.status != 200 or not any(validators[:2]):
+            return None
+        return (path, *validators)
+
+    def fingerprint(self, names=TABLES):
+        # Rely on the validators the server hands out; without them there is
+        # no cheap way to know the objects haven't changed
+        result = self.map(self._head, names)
+        return None if any(r is None for r in result) else result
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+        super().close()
+
+
+def source_from_uri(uri):
+    """Build a source from a location string.
+
+    - ``http://...`` / ``https://...``: HTTPSource
+    - ``sqlite:///data.db`` (relative) / ``sqlite:////abs/data.db``: SQLiteSource
+    - a directory containing one sub-directory per table: PartitionedDirectorySource
+    - any other directory: LocalFileSource
+    """
+    if uri.startswith(('http://', 'https://')):
+        return HTTPSource(uri)
+    if uri.startswith('sqlite:///'):
+        return SQLiteSource(uri[len('sqlite:///'):])
+    if all(os.path.isdir(os.path.join(uri, name)) for name in TABLES):
+        return PartitionedDirectorySource(uri)
+    return LocalFileSource(uri)
+
+
+def load_tables(source, names=TABLES):
+    """Read several tables from ``source`` concurrently.
+
+    All tables are fetched in parallel, so the wall-clock time is roughly
+    that of the largest table rather than the sum of all of them. Returns
+    the DataFrames in the same order as ``names``.
+    """
+    return source.map(source.read_table, names)
@@ -0,0 +1,108 @@
+import glob
+import hashlib
+import inspect
+import os
+import pickle
+import stat
+import tempfile
+
+# Bump to invalidate every cached entry after a change to how entries are stored
+CACHE_FORMAT = 1
+
+
+def code_version(*objects):
+    """Hash of the source of the functions/modules/classes a result depends on."""
+    digest = hashlib.sha256(str(CACHE_FORMAT).encode())
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode())
+    return digest.hexdigest()
+
+
+def default_cache_dir():
+    """Per-user cache location, e.g. ``~/.cache/roi_tracker``."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'roi_tracker')
+
+
+class DiskCache:
+    """Pickled results on disk, shared by every process pointed at ``directory``.
+
+    Entries are written to a temp file and renamed into place, so concurrent
+    readers only ever see complete files. When the directory grows past
+    ``max_bytes`` the least recently used entries are removed.
+
+    Loading an entry runs pickle, so the directory must belong to the current
+    user and must not be writable by anyone else; otherwise ``PermissionError``
+    is raised.
+    """
+
+    def __init__(self, directory, max_bytes=1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.stat(directory)
+        if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+            raise PermissionError(f"Cache directory {directory} is not owned by the current user")
+        if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError(f"Cache directory {directory} is writable by other users")
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.pkl')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated or written by an incompatible version; recompute
+            self._remove(path)
+            return None
+        # Mark as recently used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            self._remove(tmp)
+            raise
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, '*.pkl')):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        keep_path = self._path(keep) if keep else None
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep_path:
+                continue
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
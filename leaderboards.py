@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+
+# Influencer attributes carried into every leaderboard row
+ATTRIBUTES = ['influencer_id', 'name', 'platform', 'category', 'gender']
+
+# Columns summed per influencer, and columns averaged per influencer. Averages
+# are kept as running sum + count so partial totals can be combined freely.
+SUM_COLUMNS = ['revenue', 'orders', 'total_payout']
+MEAN_COLUMNS = ['ROAS', 'reach', 'calculated_engagement_rate']
+
+# Leaderboard metric -> column it ranks by
+METRICS = {
+    'revenue': 'revenue',
+    'ROAS': 'ROAS',
+    'orders': 'orders',
+    'engagement': 'calculated_engagement_rate',
+}
+
+
+def top_k_positions(values, k, eligible=None):
+    """Positions of the ``k`` largest ``values``, largest first.
+
+    Uses ``np.argpartition`` so only the selected ``k`` entries get sorted.
+    NaNs rank last, like ``sort_values(ascending=False)``.
+    """
+    candidates = np.arange(len(values)) if eligible is None else np.flatnonzero(eligible)
+    if k <= 0 or len(candidates) == 0:
+        return candidates[:0]
+    # numpy orders NaN after everything else, so negating keeps NaN last
+    keys = -values[candidates]
+    if k < len(candidates):
+        part = np.argpartition(keys, k - 1)[:k]
+    else:
+        part = np.arange(len(candidates))
+    return candidates[part[np.argsort(keys[part], kind='stable')]]
+
+
+def _partials(rows, positions):
+    # Collapse rows to one line per (influencer, date, brand), which is the
+    # finest grain the dashboard filters on
+    parts = pd.DataFrame({
+        'pos': positions,
+        'date': rows['date'].values,
+        'brand': rows['brand'].values,
+    })
+    for col in SUM_COLUMNS:
+        parts[col] = rows[col].fillna(0).to_numpy(dtype=float)
+    for col in MEAN_COLUMNS:
+        valid = rows[col].notna().to_numpy()
+        parts[f'{col}_sum'] = np.where(valid, rows[col].to_numpy(dtype=float), 0.0)
+        parts[f'{col}_count'] = valid.astype(float)
+    parts['rows'] = 1.0
+    return parts.groupby(['pos', 'date', 'brand'], sort=False, dropna=False).sum().reset_index()
+
+
+class InfluencerLeaderboard:
+    """Per-influencer totals with top-K queries for each metric in METRICS.
+
+    Built from merged campaign performance rows (see ``create_merged_data``).
+    New rows can be folded in with ``update()``; the unfiltered top-K lists
+    are maintained from the touched influencers instead of being rebuilt.
+    Filtered queries re-total the pre-aggregated (influencer, date, brand)
+    partials and select with ``argpartition`` rather than a full sort.
+    """
+
+    def __init__(self, campaign_performance, cache_size=100):
+        self.cache_size = cache_size
+        self.influencers = pd.DataFrame(columns=ATTRIBUTES)
+        self._index = pd.Index([])
+        self.partials = None
+        self.totals = {}
+        self._top_cache = {}
+        self.update(campaign_performance)
+
+    @property
+    def value_columns(self):
+        return SUM_COLUMNS + [f'{c}_{s}' for c in MEAN_COLUMNS for s in ('sum', 'count')] + ['rows']
+
+    def update(self, rows):
+        """Fold new campaign performance rows into the totals."""
+        # Same rows the five-key groupby would keep
+        rows = rows.dropna(subset=ATTRIBUTES)
+        if rows.empty and self.partials is not None:
+            return
+
+        unseen = rows.drop_duplicates('influencer_id')
+        unseen = unseen.loc[~unseen['influencer_id'].isin(self._index), ATTRIBUTES]
+        if not unseen.empty:
+            self.influencers = pd.concat([self.influencers, unseen], ignore_index=True)
+            self._index = pd.Index(self.influencers['influencer_id'])
+        n = len(self.influencers)
+
+        parts = _partials(rows, self._index.get_indexer(rows['influencer_id']))
+        self.partials = parts if self.partials is None else pd.concat([self.partials, parts], ignore_index=True)
+
+        # What select() needs to recognise a filter that keeps every row
+        dates, all_brands = self.partials['date'], self.partials['brand']
+        self._date_range = (dates.min(), dates.max()) if dates.notna().all() and len(dates) else (None, None)
+        self._brands = set(all_brands) if all_brands.notna().all() else None
+
+        pos = parts['pos'].to_numpy()
+        for col in self.value_columns:
+            current = self.totals.get(col, np.zeros(0))
+            current = np.pad(current, (0, n - len(current)))
+            self.totals[col] = current + np.bincount(pos, weights=parts[col].to_numpy(), minlength=n)
+
+        # Sums that only grew can't push anyone untouched into the top K, so
+        # the new top K is among the old top K plus the touched influencers.
+        # Averages can move either way and are recomputed on next use.
+        touched = np.unique(pos)
+        for key, cached in list(self._top_cache.items()):
+            metric, require_orders = key
+            col = METRICS[metric]
+            if col in SUM_COLUMNS and (parts[col] >= 0).all() and (parts['orders'] >= 0).all():
+                candidates = np.union1d(cached, touched)
+                eligible = self._eligible(self.totals, require_orders)[candidates]
+                values = self._values(self.totals, col)[candidates]
+                self._top_cache[key] = candidates[top_k_positions(values, self.cache_size, eligible)]
+            else:
+                del self._top_cache[key]
+
+    def select(self, start_date=None, end_date=None, brands=None,
+               platforms=None, categories=None, genders=None):
+        """Totals restricted to a date window, brands and influencer personas.
+
+        Empty selections don't filter, matching the sidebar filters. A filter
+        that keeps every row (the sidebar defaults) returns the maintained
+        unfiltered totals, so ``top()`` can serve its cached lists.
+        """
+        # Rows without a date or brand only survive when that filter is off
+        first_date, last_date = self._date_range
+        if start_date is not None and first_date is not None and start_date <= first_date:
+            start_date = None
+        if end_date is not None and last_date is not None and end_date >= last_date:
+            end_date = None
+        if brands and self._brands is not None and self._brands <= set(brands):
+            brands = None
+        if platforms and self.influencers['platform'].isin(platforms).all():
+            platforms = None
+        if categories and self.influencers['category'].isin(categories).all():
+            categories = None
+        if genders and self.influencers['gender'].isin(genders).all():
+            genders = None
+        if all(f is None for f in (start_date, end_date)) and not any((brands, platforms, categories, genders)):
+            return self.totals
+
+        parts = self.partials
+        mask = np.ones(len(parts), dtype=bool)
+        if start_date is not None:
+            mask &= (parts['date'] >= start_date).to_numpy()
+        if end_date is not None:
+            mask &= (parts['date'] <= end_date).to_numpy()
+        if brands:
+            mask &= parts['brand'].isin(brands).to_numpy()
+
+        persona = np.ones(len(self.influencers), dtype=bool)
+        for col, selected in (('platform', platforms), ('category', categories), ('gender', genders)):
+            if selected:
+                persona &= self.influencers[col].isin(selected).to_numpy()
+        pos = parts['pos'].to_numpy()
+        mask &= persona[pos]
+
+        n = len(self.influencers)
+        return {
+            col: np.bincount(pos[mask], weights=parts[col].to_numpy()[mask], minlength=n)
+            for col in self.value_columns
+        }
+
+    def frame(self, totals=None, positions=None):
+        """Leaderboard rows for ``positions`` (default: every influencer with data)."""
+        totals = self.totals if totals is None else totals
+        if positions is None:
+            positions = np.flatnonzero(totals['rows'] > 0)
+        result = self.influencers.iloc[positions].reset_index(drop=True)
+        for col in SUM_COLUMNS:
+            result[col] = totals[col][positions]
+        result['orders'] = result['orders'].round().astype('int64')
+        for col in MEAN_COLUMNS:
+            result[col] = self._values(totals, col)[positions]
+        return result
+
+    def top(self, metric, k=10, totals=None, require_orders=False):
+        """Top ``k`` influencers by ``metric``, optionally only those with orders."""
+        col = METRICS[metric]
+        if totals is None or totals is self.totals:
+            key = (metric, require_orders)
+            if k <= self.cache_size:
+                if key not in self._top_cache:
+                    self._top_cache[key] = top_k_positions(
+                        self._values(self.totals, col), self.cache_size,
+                        self._eligible(self.totals, require_orders))
+                return self.frame(self.totals, self._top_cache[key][:k])
+            totals = self.totals
+        positions = top_k_positions(self._values(totals, col), k, self._eligible(totals, require_orders))
+        return self.frame(totals, positions)
+
+    @staticmethod
+    def _values(totals, col):
+        if col in SUM_COLUMNS:
+            return totals[col]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(totals[f'{col}_count'] > 0, totals[f'{col}_sum'] / totals[f'{col}_count'], np.nan)
+
+    @staticmethod
+    def _eligible(totals, require_orders):
+        eligible = totals['rows'] > 0
+        if require_orders:
+            eligible &= totals['orders'] > 0
+        return eligible
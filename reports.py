@@ -0,0 +1,262 @@
+import argparse
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from fontTools import subset, ttLib
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from data_sources import source_from_uri, load_tables
+
+FONT_FAMILY = "DejaVu"
+FONT_DIR = os.path.dirname(os.path.abspath(__file__))
+FONT_FILES = {
+    "": os.path.join(FONT_DIR, "DejaVuSans.ttf"),
+    "B": os.path.join(FONT_DIR, "DejaVuSans-Bold.ttf"),
+}
+
+# Fixed labels and number formatting are all printable ASCII plus the rupee sign
+REPORT_CHARS = frozenset({chr(c) for c in range(0x20, 0x7f)} | {"₹"})
+
+# style -> font file used by add_fonts in this process
+_font_files = dict(FONT_FILES)
+
+
+def subset_fonts(chars, directory):
+    """Write copies of the report fonts cut down to ``chars`` into ``directory``.
+
+    ``FPDF.add_font`` parses the font file again for every document, and
+    fpdf offers no supported way to share a parsed font between documents
+    (writing a PDF subsets the parsed font in place). Parsing the full
+    DejaVu files is most of the cost of a small report; the subsets are a
+    fraction of the size, so that per-document parse becomes cheap.
+    Returns a ``{style: path}`` mapping for ``add_fonts``/``use_fonts``.
+    """
+    files = {}
+    for style, path in FONT_FILES.items():
+        options = subset.Options(notdef_outline=True, recommended_glyphs=True)
+        options.drop_tables += ["FFTM"]
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes={ord(c) for c in chars})
+        font = ttLib.TTFont(path)
+        subsetter.subset(font)
+        files[style] = os.path.join(directory, os.path.basename(path))
+        font.save(files[style])
+    return files
+
+
+def use_fonts(files):
+    """Make ``add_fonts`` in this process use ``files`` instead of the full fonts."""
+    _font_files.update(files)
+
+
+def add_fonts(pdf, files=None):
+    """Register the DejaVu fonts on ``pdf``, from ``files`` if given."""
+    for style, path in (files or _font_files).items():
+        pdf.add_font(FONT_FAMILY, style, path)
+
+
+def format_currency(amount):
+    return f"₹{amount:,.0f}"
+
+
+def monthly_statements(influencers, tracking_data, payouts, month):
+    """Statement data for every influencer for ``month`` (a ``pd.Period``)."""
+    month_payouts = payouts[payouts['payout_date'].dt.to_period('M') == month]
+    month_tracking = tracking_data[tracking_data['date'].dt.to_period('M') == month]
+
+    payout_lines = month_payouts.groupby(['influencer_id', 'campaign', 'basis', 'status']).agg({
+        'posts_count': 'sum',
+        'orders': 'sum',
+        'total_payout': 'sum'
+    }).reset_index()
+    lines_by_influencer = {k: g for k, g in payout_lines.groupby('influencer_id')}
+
+    attributed = month_tracking.groupby('influencer_id').agg({
+        'revenue': 'sum',
+        'orders': 'sum'
+    })
+
+    statements = []
+    for row in influencers.itertuples(index=False):
+        lines = lines_by_influencer.get(row.influencer_id)
+        revenue = attributed['revenue'].get(row.influencer_id, 0.0)
+        payout = lines['total_payout'].sum() if lines is not None else 0.0
+        statements.append({
+            'influencer_id': row.influencer_id,
+            'name': row.name,
+            'platform': row.platform,
+            'category': row.category,
+            'month': str(month),
+            'revenue': float(revenue),
+            'orders': int(attributed['orders'].get(row.influencer_id, 0)),
+            'total_payout': float(payout),
+            'ROAS': revenue / payout if payout else None,
+            'lines': [] if lines is None else list(
+                lines[['campaign', 'basis', 'status', 'posts_count', 'orders', 'total_payout']]
+                .itertuples(index=False, name=None)
+            ),
+        })
+    return statements
+
+
+def render_statement(statement):
+    """Render one influencer statement and return the PDF bytes."""
+    pdf = FPDF()
+    add_fonts(pdf)
+    pdf.add_page()
+
+    pdf.set_font(FONT_FAMILY, "B", 16)
+    pdf.cell(0, 10, "HealthKart Influencer Statement", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+    pdf.set_font(FONT_FAMILY, size=12)
+    pdf.cell(0, 8, f"{statement['name']} ({statement['influencer_id']}) - {statement['platform']}, {statement['category']}",
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+    pdf.cell(0, 8, f"Period: {statement['month']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+    pdf.ln(8)
+
+    pdf.set_font(FONT_FAMILY, "B", 14)
+    pdf.cell(0, 10, "Summary", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font(FONT_FAMILY, size=12)
+    roas = f"{statement['ROAS']:.2f}" if statement['ROAS'] is not None else "n/a"
+    pdf.cell(0, 8, f"Attributed Revenue: {format_currency(statement['revenue'])}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(0, 8, f"Attributed Orders: {statement['orders']:,}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(0, 8, f"Total Payout: {format_currency(statement['total_payout'])}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(0, 8, f"ROAS: {roas}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(8)
+
+    pdf.set_font(FONT_FAMILY, "B", 14)
+    pdf.cell(0, 10, "Payouts", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    if not statement['lines']:
+        pdf.set_font(FONT_FAMILY, size=12)
+        pdf.cell(0, 8, "No payouts this period.", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    else:
+        widths = [50, 22, 25, 22, 22, 49]
+        headers = ["Campaign", "Basis", "Status", "Posts", "Orders", "Payout"]
+        pdf.set_font(FONT_FAMILY, "B", 10)
+        for width, header in zip(widths, headers):
+            pdf.cell(width, 8, header, border=1)
+        pdf.ln()
+        pdf.set_font(FONT_FAMILY, size=10)
+        for campaign, basis, status, posts_count, orders, payout in statement['lines']:
+            values = [campaign, basis, status, f"{posts_count:,}", f"{orders:,}", format_currency(payout)]
+            for width, value in zip(widths, values):
+                pdf.cell(width, 8, str(value), border=1)
+            pdf.ln()
+
+    return bytes(pdf.output())
+
+
+def _render_named(statement):
+    return f"{statement['month']}/{statement['influencer_id']}.pdf", render_statement(statement)
+
+
+def statement_chars(statements):
+    """Every character the given statements can print."""
+    chars = set(REPORT_CHARS)
+    for statement in statements:
+        for key in ('name', 'influencer_id', 'platform', 'category'):
+            chars.update(str(statement[key]))
+        for line in statement['lines']:
+            for value in line[:3]:
+                chars.update(str(value))
+    return chars
+
+
+def generate_statements(statements, out, workers=None, chunksize=16):
+    """Render ``statements`` in a process pool and write them to ``out``.
+
+    ``out`` ending in ``.zip`` produces one archive, anything else is used as
+    a directory with one sub-directory per month. Returns the number of PDFs.
+    """
+    workers = workers or os.cpu_count() or 1
+    # Fonts are subset once, to just what gets printed, and shared by the workers
+    font_dir = tempfile.mkdtemp(prefix='roi_fonts_')
+    previous_fonts = dict(_font_files)
+    pool = None
+    try:
+        files = subset_fonts(statement_chars(statements), font_dir)
+        if workers == 1:
+            use_fonts(files)
+            rendered = map(_render_named, statements)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=use_fonts, initargs=(files,))
+            rendered = pool.map(_render_named, statements, chunksize=chunksize)
+        return _write_statements(rendered, out)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        use_fonts(previous_fonts)
+        shutil.rmtree(font_dir, ignore_errors=True)
+
+
+def _write_statements(rendered, out):
+    count = 0
+    if out.endswith('.zip'):
+        # PDFs are already compressed; storing them keeps the writer fast
+        with zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for name, data in rendered:
+                archive.writestr(name, data)
+                count += 1
+    else:
+        for name, data in rendered:
+            path = os.path.join(out, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+            count += 1
+    return count
+
+
+def parse_month(value):
+    # pd.Period alone also accepts things like "June" or "2025"
+    try:
+        if not re.fullmatch(r'\d{4}-\d{2}', value):
+            raise ValueError(value)
+        return pd.Period(value, freq='M')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid month {value!r}, expected YYYY-MM")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate monthly influencer statements, e.g. "
+                    "python reports.py --month 2025-06 --out statements.zip"
+    )
+    parser.add_argument('--month', action='append', type=parse_month,
+                        help="Month as YYYY-MM; repeat for several. Defaults to every month with payouts.")
+    parser.add_argument('--out', default='statements.zip',
+                        help="A .zip file or an output directory (default: statements.zip)")
+    parser.add_argument('--source', default=os.environ.get('ROI_DATA_SOURCE', '.'),
+                        help="Data location, as for ROI_DATA_SOURCE")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: one per core)")
+    args = parser.parse_args()
+
+    source = source_from_uri(args.source)
+    try:
+        influencers, tracking_data, payouts = load_tables(
+            source, names=['influencers', 'tracking_data', 'payouts'])
+    finally:
+        source.close()
+    tracking_data['date'] = pd.to_datetime(tracking_data['date'])
+    payouts['payout_date'] = pd.to_datetime(payouts['payout_date'])
+
+    if args.month:
+        months = args.month
+    else:
+        months = sorted(payouts['payout_date'].dt.to_period('M').dropna().unique())
+
+    statements = []
+    for month in months:
+        statements.extend(monthly_statements(influencers, tracking_data, payouts, month))
+    count = generate_statements(statements, args.out, workers=args.workers)
+    print(f"Wrote {count} statements to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from chart_data import _as_number, box_figure, box_stats, downsample_lines, lttb_indices
+
+
+def roas_rows(n_rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'platform': rng.choice(['Instagram', 'YouTube'], n_rows),
+        'brand': rng.choice(['MuscleBlaze', 'HKVitals', 'Gritzo'], n_rows),
+        'ROAS': rng.standard_cauchy(n_rows),
+    })
+
+
+def daily_rows(n_days=2000, brands=('MuscleBlaze', 'HKVitals', 'Gritzo'), seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2020-01-01', periods=n_days, freq='D')
+    return pd.DataFrame({
+        'period': np.tile(dates.date, len(brands)),
+        'brand': np.repeat(brands, n_days),
+        'revenue': rng.exponential(1000, n_days * len(brands)),
+        'total_payout': rng.exponential(500, n_days * len(brands)),
+    })
+
+
+def test_lttb_keeps_ends_and_returns_n_out_sorted_indices():
+    rng = np.random.default_rng(0)
+    x = np.arange(1000, dtype=float)
+    y = rng.normal(size=1000).cumsum()
+
+    for n_out in (3, 10, 250, 999):
+        kept = lttb_indices(x, y, n_out)
+        assert len(kept) == n_out
+        assert kept[0] == 0 and kept[-1] == len(x) - 1
+        assert (np.diff(kept) > 0).all()
+    assert (lttb_indices(x, y, 5000) == np.arange(1000)).all()
+
+
+def test_downsample_lines_stays_within_budget():
+    df = daily_rows()
+    y = ['revenue', 'total_payout']
+
+    for budget in (300, 1000, 5000):
+        thinned = downsample_lines(df, 'period', y, 'brand', budget=budget)
+        assert len(thinned) * len(y) <= budget
+        assert set(thinned['brand']) == set(df['brand'])
+        for _, group in thinned.groupby('brand'):
+            assert group['period'].min() == df['period'].min()
+            assert group['period'].max() == df['period'].max()
+
+    assert downsample_lines(df, 'period', y, 'brand', budget=len(df) * len(y)) is df
+
+
+def test_as_number_accepts_dates():
+    df = daily_rows(n_days=3, brands=('MuscleBlaze',))
+    numbers = _as_number(df['period'])
+
+    # Any unit will do for LTTB, as long as days stay ordered and evenly spaced
+    steps = np.diff(numbers)
+    assert (steps > 0).all() and (steps == steps[0]).all()
+
+
+def test_box_stats_keeps_outliers_outside_the_fences():
+    df = roas_rows()
+    stats, outliers = box_stats(df, 'ROAS', ['platform', 'brand'])
+
+    assert stats['count'].sum() == len(df)
+    bounds = outliers.merge(stats, on=['platform', 'brand'])
+    assert ((bounds['ROAS'] < bounds['lowerfence']) | (bounds['ROAS'] > bounds['upperfence'])).all()
+
+
+def test_box_stats_caps_outliers_to_the_most_extreme():
+    df = roas_rows()
+    _, everything = box_stats(df, 'ROAS', ['platform', 'brand'])
+    _, capped = box_stats(df, 'ROAS', ['platform', 'brand'], budget=50)
+
+    assert len(capped) == 50
+    assert capped['distance'].min() >= everything['distance'].nlargest(50).min()
+
+
+def test_box_figure_overlays_outliers_in_webgl():
+    stats, outliers = box_stats(roas_rows(), 'ROAS', ['platform', 'brand'])
+    fig = box_figure(stats, outliers, x='platform', y='ROAS', color='brand', title='', y_title='ROAS')
+
+    assert [trace.type for trace in fig.data].count('box') == 3
+    points = [trace for trace in fig.data if trace.type == 'scattergl']
+    assert sum(len(trace.y) for trace in points) == len(outliers)
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from comparison import CURRENT, PREVIOUS, compare_groups, compare_totals, label_periods
+
+
+def performance_rows(n_rows=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.Timestamp('2025-04-01') + pd.to_timedelta(rng.integers(0, 91, n_rows), unit='D'),
+        'campaign': rng.choice(['Summer Shred', 'Immunity Boost', 'Kids Growth'], n_rows),
+        'revenue': rng.exponential(1000, n_rows),
+        'orders': rng.integers(0, 5, n_rows),
+    })
+
+
+def window(start, end):
+    return pd.Timestamp(start), pd.Timestamp(end)
+
+
+def labelled_by_window(df, periods):
+    return {
+        label: df[(df['date'] >= start) & (df['date'] <= end)]
+        for label, (start, end) in periods.items()
+    }
+
+
+def test_label_periods_disjoint_windows():
+    df = performance_rows()
+    periods = {CURRENT: window('2025-06-01', '2025-06-30'), PREVIOUS: window('2025-05-01', '2025-05-31')}
+    labelled = label_periods(df, 'date', periods)
+    expected = labelled_by_window(df, periods)
+
+    assert list(labelled['period'].cat.categories) == [CURRENT, PREVIOUS]
+    assert not labelled.index.duplicated().any()
+    for label, rows in expected.items():
+        assert labelled.index[labelled['period'] == label].sort_values().equals(rows.index.sort_values())
+
+
+def test_label_periods_overlapping_windows_repeat_rows():
+    df = performance_rows()
+    periods = {CURRENT: window('2025-05-15', '2025-06-30'), PREVIOUS: window('2025-05-01', '2025-05-31')}
+    labelled = label_periods(df, 'date', periods)
+    expected = labelled_by_window(df, periods)
+
+    shared = expected[CURRENT].index.intersection(expected[PREVIOUS].index)
+    assert len(shared) > 0
+    assert len(labelled) == len(expected[CURRENT]) + len(expected[PREVIOUS])
+    assert set(labelled.loc[shared, 'period']) == {CURRENT, PREVIOUS}
+
+    totals = compare_totals(labelled, {'revenue': 'sum'})
+    assert np.isclose(totals['revenue_current'], expected[CURRENT]['revenue'].sum())
+    assert np.isclose(totals['revenue_previous'], expected[PREVIOUS]['revenue'].sum())
+
+
+def test_compare_groups_matches_groupby_per_period():
+    df = performance_rows()
+    periods = {CURRENT: window('2025-06-01', '2025-06-30'), PREVIOUS: window('2025-05-01', '2025-05-31')}
+    result = compare_groups(label_periods(df, 'date', periods), ['campaign'], {'revenue': 'sum', 'orders': 'sum'})
+    expected = labelled_by_window(df, periods)
+
+    result = result.set_index('campaign')
+    for label, rows in expected.items():
+        sums = rows.groupby('campaign')['revenue'].sum()
+        assert np.allclose(result.loc[sums.index, f'revenue_{label}'], sums)
+    change = result['revenue_current'] - result['revenue_previous']
+    assert np.allclose(result['revenue_change'], change)
+    assert np.allclose(result['revenue_change_pct'], change / result['revenue_previous'] * 100)
+
+
+def test_change_pct_is_nan_when_previous_is_zero():
+    df = pd.DataFrame({
+        'date': pd.to_datetime(['2025-05-10', '2025-06-10', '2025-05-10', '2025-06-10']),
+        'campaign': ['Summer Shred', 'Summer Shred', 'Kids Growth', 'Kids Growth'],
+        'orders': [0, 4, 2, 3],
+    })
+    periods = {CURRENT: window('2025-06-01', '2025-06-30'), PREVIOUS: window('2025-05-01', '2025-05-31')}
+    labelled = label_periods(df, 'date', periods)
+
+    groups = compare_groups(labelled, ['campaign'], {'orders': 'sum'}).set_index('campaign')
+    assert groups.loc['Summer Shred', 'orders_change'] == 4
+    assert np.isnan(groups.loc['Summer Shred', 'orders_change_pct'])
+    assert groups.loc['Kids Growth', 'orders_change_pct'] == 50
+
+    totals = compare_totals(labelled[labelled['campaign'] == 'Summer Shred'], {'orders': 'sum'})
+    assert totals['orders_change'] == 4
+    assert np.isnan(totals['orders_change_pct'])
+
+
+def test_empty_input():
+    periods = {CURRENT: window('2025-06-01', '2025-06-30'), PREVIOUS: window('2025-05-01', '2025-05-31')}
+    labelled = label_periods(performance_rows().iloc[:0], 'date', periods)
+
+    groups = compare_groups(labelled, ['campaign'], {'revenue': 'sum'})
+    assert groups.empty
+    assert list(groups.columns) == [
+        'campaign', 'revenue_current', 'revenue_previous', 'revenue_change', 'revenue_change_pct'
+    ]
+
+    totals = compare_totals(labelled, {'revenue': 'sum'})
+    assert totals['revenue_current'] == 0 and totals['revenue_previous'] == 0
+    assert totals['revenue_change'] == 0
+    assert np.isnan(totals['revenue_change_pct'])
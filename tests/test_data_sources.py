@@ -0,0 +1,112 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data_sources import TABLES, HTTPSource, load_tables
+
+
+class StubServer:
+    """Serves small CSVs over keep-alive HTTP/1.1 and records what it saw."""
+
+    def __init__(self, files, failures=None):
+        self.files = files
+        self.failures = dict(failures or {})
+        self.requests = []
+        self.connections = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _respond(self, body_wanted):
+                stub.requests.append((self.command, self.path))
+                stub.connections.add(self.client_address)
+                status, body = 200, stub.files.get(self.path)
+                if body is None:
+                    status, body = 404, b'missing'
+                elif stub.failures.get(self.path):
+                    stub.failures[self.path] -= 1
+                    status, body = 503, b'busy'
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', f'"{hash(body)}"')
+                self.end_headers()
+                if body_wanted:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self._respond(True)
+
+            def do_HEAD(self):
+                self._respond(False)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/data'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def table_files():
+    return {f'/data/{name}.csv': f'id,value\n{name},1\n{name},2\n'.encode() for name in TABLES}
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**kwargs):
+        server = StubServer(table_files(), **kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def test_loads_all_tables_over_reused_connections(stub):
+    server = stub()
+    source = HTTPSource(server.url, backoff=0)
+    try:
+        assert source.fingerprint() is not None
+        tables = load_tables(source)
+        tables = load_tables(source)
+    finally:
+        source.close()
+
+    assert [t['id'].iloc[0] for t in tables] == TABLES
+    assert all(len(t) == 2 for t in tables)
+    # One keep-alive connection per pool thread, shared by HEADs and GETs
+    assert len(server.requests) == 3 * len(TABLES)
+    assert len(server.connections) <= source.max_workers
+
+
+def test_retries_after_503(stub):
+    server = stub(failures={'/data/posts.csv': 2})
+    source = HTTPSource(server.url, retries=3, backoff=0)
+    try:
+        posts = source.read_table('posts')
+    finally:
+        source.close()
+
+    assert list(posts['id']) == ['posts', 'posts']
+    assert server.requests.count(('GET', '/data/posts.csv')) == 3
+
+
+def test_404_fails_without_retrying(stub):
+    server = stub()
+    source = HTTPSource(server.url, retries=3, backoff=0)
+    try:
+        with pytest.raises(IOError, match='404'):
+            source.read_table('unknown')
+    finally:
+        source.close()
+
+    assert server.requests == [('GET', '/data/unknown.csv')]
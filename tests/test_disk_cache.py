@@ -0,0 +1,49 @@
+import os
+import time
+
+import pytest
+
+from disk_cache import DiskCache
+
+
+def test_round_trip_and_miss(tmp_path):
+    cache = DiskCache(str(tmp_path / 'cache'))
+    key = cache.key('fingerprint', 'code')
+    assert cache.get(key) is None
+    cache.put(key, {'rows': [1, 2, 3]})
+    assert cache.get(key) == {'rows': [1, 2, 3]}
+    assert cache.get(cache.key('fingerprint', 'other code')) is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path / 'cache'), max_bytes=2500)
+    for i in range(4):
+        cache.put(str(i), b'x' * 1000)
+        time.sleep(0.01)
+    assert cache.get('0') is None
+    assert cache.get('3') == b'x' * 1000
+
+
+def test_corrupt_entry_is_dropped(tmp_path):
+    cache = DiskCache(str(tmp_path / 'cache'))
+    with open(os.path.join(cache.directory, 'bad.pkl'), 'wb') as f:
+        f.write(b'not a pickle')
+    assert cache.get('bad') is None
+    assert not os.path.exists(os.path.join(cache.directory, 'bad.pkl'))
+
+
+def test_refuses_directory_others_can_write(tmp_path):
+    directory = tmp_path / 'shared'
+    directory.mkdir()
+    directory.chmod(0o777)
+    with pytest.raises(PermissionError):
+        DiskCache(str(directory))
+
+
+@pytest.mark.skipif(not hasattr(os, 'geteuid') or os.geteuid() != 0, reason="needs root to chown")
+def test_refuses_directory_owned_by_someone_else(tmp_path):
+    directory = tmp_path / 'theirs'
+    directory.mkdir(mode=0o700)
+    os.chown(directory, 12345, -1)
+    with pytest.raises(PermissionError):
+        DiskCache(str(directory))
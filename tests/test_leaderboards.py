@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from leaderboards import METRICS, InfluencerLeaderboard
+
+
+def performance_rows(n_rows=3000, n_influencers=400, seed=0):
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(0, n_influencers, n_rows)
+    return pd.DataFrame({
+        'influencer_id': [f'INF_{i:04d}' for i in ids],
+        'name': [f'Influencer_{i}' for i in ids],
+        'platform': np.array(['Instagram', 'YouTube', 'Twitter'])[ids % 3],
+        'category': np.array(['Fitness', 'Health'])[ids % 2],
+        'gender': np.array(['Male', 'Female'])[ids % 2],
+        'date': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 90, n_rows), unit='D'),
+        'brand': rng.choice(['MuscleBlaze', 'HKVitals', 'Gritzo'], n_rows),
+        'revenue': rng.exponential(1000, n_rows),
+        'orders': rng.integers(0, 5, n_rows),
+        'total_payout': rng.exponential(500, n_rows),
+        'ROAS': rng.exponential(2, n_rows),
+        'reach': rng.exponential(10000, n_rows),
+        'calculated_engagement_rate': rng.exponential(3, n_rows),
+    })
+
+
+def top_lists(leaderboard, k=20):
+    return {
+        (metric, require_orders): leaderboard.top(metric, k, require_orders=require_orders)
+        for metric in METRICS
+        for require_orders in (False, True)
+    }
+
+
+def test_chunked_updates_match_a_rebuild():
+    rows = performance_rows()
+    rebuilt = InfluencerLeaderboard(rows, cache_size=50)
+
+    chunks = np.array_split(np.arange(len(rows)), 6)
+    updated = InfluencerLeaderboard(rows.iloc[chunks[0]], cache_size=50)
+    for chunk in chunks[1:]:
+        # Query between updates so the cached lists are maintained, not rebuilt
+        top_lists(updated)
+        updated.update(rows.iloc[chunk])
+
+    expected, actual = top_lists(rebuilt), top_lists(updated)
+    for key, frame in expected.items():
+        metric = METRICS[key[0]]
+        # Orders are small integers with ties, so compare values rather than ids
+        compare = [metric] if metric == 'orders' else ['influencer_id', metric]
+        pd.testing.assert_frame_equal(
+            actual[key][compare].reset_index(drop=True),
+            frame[compare].reset_index(drop=True)
+        )
+
+
+def test_unfiltered_selection_matches_groupby():
+    rows = performance_rows(seed=1)
+    leaderboard = InfluencerLeaderboard(rows)
+    totals = leaderboard.select(
+        rows['date'].min(), rows['date'].max() + pd.Timedelta(days=1),
+        list(rows['brand'].unique()), list(rows['platform'].unique()),
+        list(rows['category'].unique()), list(rows['gender'].unique())
+    )
+    # Selecting everything serves the maintained totals
+    assert totals is leaderboard.totals
+
+    expected = rows.groupby('influencer_id')['revenue'].sum().nlargest(10)
+    top = leaderboard.top('revenue', 10, totals)
+    assert list(top['influencer_id']) == list(expected.index)
+    np.testing.assert_allclose(top['revenue'], expected.values)
+
+
+def test_filtered_selection_matches_groupby():
+    rows = performance_rows(seed=2)
+    leaderboard = InfluencerLeaderboard(rows)
+    start, end = pd.Timestamp('2025-02-01'), pd.Timestamp('2025-03-01')
+    totals = leaderboard.select(start, end, ['Gritzo'], ['YouTube'])
+    assert totals is not leaderboard.totals
+
+    subset = rows[(rows['date'] >= start) & (rows['date'] <= end)
+                  & (rows['brand'] == 'Gritzo') & (rows['platform'] == 'YouTube')]
+    expected = subset.groupby('influencer_id')['ROAS'].mean().nlargest(5)
+    top = leaderboard.top('ROAS', 5, totals)
+    assert list(top['influencer_id']) == list(expected.index)
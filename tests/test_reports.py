@@ -0,0 +1,71 @@
+import argparse
+import zipfile
+from io import BytesIO
+
+import pytest
+from pypdf import PdfReader
+
+from fpdf import FPDF
+
+from reports import (FONT_FAMILY, FONT_FILES, REPORT_CHARS, _font_files, add_fonts, generate_statements,
+                     parse_month, render_statement, subset_fonts)
+
+
+def statement(influencer_id='INF_0001', name='Aarav Śharma'):
+    return {
+        'influencer_id': influencer_id,
+        'name': name,
+        'platform': 'Instagram',
+        'category': 'Fitness',
+        'month': '2025-06',
+        'revenue': 125000.0,
+        'orders': 42,
+        'total_payout': 25000.0,
+        'ROAS': 5.0,
+        'lines': [('Summer Shred', 'post', 'paid', 3, 42, 25000.0)],
+    }
+
+
+def pdf_text(data):
+    return '\n'.join(page.extract_text() for page in PdfReader(BytesIO(data)).pages)
+
+
+def test_render_statement_reads_back():
+    text = pdf_text(render_statement(statement()))
+
+    assert 'Aarav Śharma (INF_0001)' in text
+    assert 'Total Payout: ₹25,000' in text
+    assert 'ROAS: 5.00' in text
+    assert 'Summer Shred' in text
+
+
+def test_generate_statements_with_subset_fonts(tmp_path):
+    statements = [statement(f'INF_{i:04d}', f'Influencer {i}') for i in range(3)]
+    out = str(tmp_path / 'statements.zip')
+
+    assert generate_statements(statements, out, workers=1) == 3
+    with zipfile.ZipFile(out) as archive:
+        assert sorted(archive.namelist()) == [f'2025-06/INF_{i:04d}.pdf' for i in range(3)]
+        text = pdf_text(archive.read('2025-06/INF_0002.pdf'))
+    assert 'Influencer 2 (INF_0002)' in text
+    assert 'Total Payout: ₹25,000' in text
+    # The temporary subsets are gone, so the full fonts are back in use
+    assert _font_files == FONT_FILES
+
+
+def test_add_fonts_from_subsets(tmp_path):
+    files = subset_fonts(REPORT_CHARS | set('Aarav Śharma'), str(tmp_path))
+    pdf = FPDF()
+    add_fonts(pdf, files)
+    pdf.add_page()
+    pdf.set_font(FONT_FAMILY, 'B', 12)
+    pdf.cell(0, 10, 'Aarav Śharma - ₹1,200')
+
+    assert 'Aarav Śharma - ₹1,200' in pdf_text(bytes(pdf.output()))
+
+
+def test_month_rejects_bad_values():
+    assert str(parse_month('2025-06')) == '2025-06'
+    for value in ('June', '2025', '2025-13'):
+        with pytest.raises(argparse.ArgumentTypeError, match='expected YYYY-MM'):
+            parse_month(value)